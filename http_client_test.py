@@ -1,6 +1,6 @@
 """
 Cliente de prueba para el Servidor HTTP
-Realiza múltiples solicitudes concurrentes para probar ThreadingMixIn
+Realiza múltiples solicitudes concurrentes para probar el servidor
 
 Universidad de Colima - Maestría en Tecnologías de Internet
 """
@@ -10,55 +10,178 @@ import threading
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+# httptools (binding de llhttp, el parser C de Node.js) parsea la respuesta
+# mucho más rápido que el parser en Python puro (opcional)
+try:
+    import httptools
+except ImportError:
+    httptools = None
+
 
 HOST = 'localhost'
 PORT = 8080
 
 
+class _ResponseParserCallbacks:
+    """
+    Callbacks para httptools.HttpResponseParser.
+    Acumula headers, texto de estado y fragmentos del cuerpo.
+    """
+    __slots__ = ('headers', 'body_parts', 'status')
+
+    def __init__(self):
+        self.headers = {}
+        self.body_parts = []
+        self.status = b''
+
+    def on_status(self, status):
+        self.status += status
+
+    def on_header(self, name, value):
+        self.headers[name.decode('latin-1')] = value.decode('latin-1')
+
+    def on_body(self, body):
+        self.body_parts.append(body)
+
+
+# Pool de conexiones persistentes: cada hilo reutiliza su propio socket
+# por (host, puerto), evitando el 3-way handshake en cada solicitud
+_connections = threading.local()
+
+
+def _get_connection(host, port):
+    """
+    Devuelve el socket persistente del hilo actual para (host, port),
+    creándolo y conectándolo si todavía no existe.
+    """
+    pool = getattr(_connections, 'pool', None)
+    if pool is None:
+        pool = _connections.pool = {}
+
+    s = pool.get((host, port))
+    if s is None:
+        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        s.settimeout(10)  # Timeout de 10 segundos
+        s.connect((host, port))
+        pool[(host, port)] = s
+    return s
+
+
+def _close_connection(host, port):
+    """
+    Cierra y descarta el socket persistente del hilo actual para (host, port).
+    """
+    pool = getattr(_connections, 'pool', None)
+    if pool is None:
+        return
+    s = pool.pop((host, port), None)
+    if s is not None:
+        s.close()
+
+
+def _exchange(s, path, method):
+    """
+    Envía una solicitud por un socket ya conectado y lee la respuesta
+    completa, delimitada por Content-Length (requisito del keep-alive).
+
+    Returns:
+        bytes: La respuesta HTTP completa
+
+    Raises:
+        ConnectionResetError: si el servidor cerró la conexión persistente
+    """
+    # Construir solicitud HTTP
+    request = f"{method} {path} HTTP/1.1\r\n"
+    request += f"Host: {HOST}:{PORT}\r\n"
+    request += "User-Agent: PythonClient/1.0\r\n"
+    request += "Accept: */*\r\n"
+    request += "Connection: keep-alive\r\n"
+    request += "\r\n"
+
+    # Enviar solicitud
+    s.sendall(request.encode('utf-8'))
+
+    # Leer hasta tener la cabecera completa. Se acumulan los fragmentos en
+    # una lista y se unen al final: repetir "response += chunk" copia todos
+    # los bytes ya recibidos en cada iteración (costo cuadrático)
+    parts = []
+    received = 0
+    header_end = -1
+    while header_end == -1:
+        chunk = s.recv(65536)
+        if not chunk:
+            if not parts:
+                # El servidor cerró el socket ocioso: hay que reconectar
+                raise ConnectionResetError('conexión persistente cerrada')
+            return b''.join(parts)
+        parts.append(chunk)
+        received += len(chunk)
+        # El CRLFCRLF puede quedar partido entre fragmentos: buscar sobre
+        # el acumulado (las cabeceras son pequeñas, la unión es barata)
+        response = b''.join(parts)
+        header_end = response.find(b'\r\n\r\n')
+
+    # Con keep-alive, Content-Length marca dónde termina esta respuesta
+    header_block = response[:header_end].lower()
+    idx = header_block.find(b'content-length:')
+    if idx == -1 or method == 'HEAD':
+        body_length = 0
+    else:
+        line_end = header_block.find(b'\r\n', idx)
+        if line_end == -1:
+            line_end = header_end
+        body_length = int(header_block[idx + 15:line_end])
+
+    total = header_end + 4 + body_length
+    while received < total:
+        chunk = s.recv(65536)
+        if not chunk:
+            break
+        parts.append(chunk)
+        received += len(chunk)
+    response = b''.join(parts)
+
+    # Si el servidor pidió cerrar, no reutilizar este socket
+    if b'connection: close' in header_block:
+        _close_connection(HOST, PORT)
+
+    return response
+
+
 def make_http_request(path, method='GET'):
     """
     Realiza una solicitud HTTP y retorna la respuesta.
-    
+
+    Reutiliza una conexión persistente por hilo (keep-alive); si el
+    servidor la cerró mientras estaba ociosa, reconecta una vez.
+
     Args:
         path: Ruta del recurso
         method: Método HTTP (GET o HEAD)
-    
+
     Returns:
         dict: Diccionario con status_code, headers, y body
     """
     try:
-        # Crear socket TCP
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            s.settimeout(10)  # Timeout de 10 segundos
-            s.connect((HOST, PORT))
-            
-            # Construir solicitud HTTP
-            request = f"{method} {path} HTTP/1.1\r\n"
-            request += f"Host: {HOST}:{PORT}\r\n"
-            request += "User-Agent: PythonClient/1.0\r\n"
-            request += "Accept: */*\r\n"
-            request += "Connection: close\r\n"
-            request += "\r\n"
-            
-            # Enviar solicitud
-            s.sendall(request.encode('utf-8'))
-            
-            # Recibir respuesta
-            response = b''
-            while True:
-                chunk = s.recv(4096)
-                if not chunk:
-                    break
-                response += chunk
-            
-            # Parsear respuesta
-            return parse_response(response)
-            
+        s = _get_connection(HOST, PORT)
+        try:
+            response = _exchange(s, path, method)
+        except (ConnectionResetError, BrokenPipeError):
+            # Socket obsoleto del pool: reconectar y reintentar una vez
+            _close_connection(HOST, PORT)
+            s = _get_connection(HOST, PORT)
+            response = _exchange(s, path, method)
+
+        # Parsear respuesta
+        return parse_response(response)
+
     except socket.timeout:
+        _close_connection(HOST, PORT)
         return {'error': 'Timeout', 'status_code': None}
     except ConnectionRefusedError:
         return {'error': 'Conexión rechazada - ¿El servidor está corriendo?', 'status_code': None}
     except Exception as e:
+        _close_connection(HOST, PORT)
         return {'error': str(e), 'status_code': None}
 
 
@@ -72,34 +195,66 @@ def parse_response(response):
     Returns:
         dict: Diccionario con componentes de la respuesta
     """
+    # Ruta rápida: parser en C de httptools, si está instalado
+    if httptools is not None:
+        try:
+            callbacks = _ResponseParserCallbacks()
+            parser = httptools.HttpResponseParser(callbacks)
+            parser.feed_data(response)
+
+            body = b''.join(callbacks.body_parts)
+            return {
+                'status_code': parser.get_status_code(),
+                'status_text': callbacks.status.decode('latin-1'),
+                'version': 'HTTP/' + parser.get_http_version(),
+                'headers': callbacks.headers,
+                'body': body,
+                'body_length': len(body)
+            }
+        except httptools.HttpParserError:
+            return {'error': 'Respuesta mal formada', 'status_code': None}
+        except Exception as e:
+            return {'error': str(e), 'status_code': None}
+
     try:
         # Separar headers del body
         header_end = response.find(b'\r\n\r\n')
         if header_end == -1:
             return {'error': 'Respuesta mal formada', 'status_code': None}
-        
-        header_section = response[:header_end].decode('utf-8', errors='ignore')
+
         body = response[header_end + 4:]
-        
-        # Parsear línea de estado
-        lines = header_section.split('\r\n')
-        status_line = lines[0]
+
+        # Parsear línea de estado (solo se decodifica esa línea)
+        line_end = response.find(b'\r\n')
+        if line_end < 0 or line_end > header_end:
+            line_end = header_end
+
+        status_line = response[:line_end].decode('latin-1')
         parts = status_line.split(' ', 2)
-        
+
         if len(parts) >= 2:
             version = parts[0]
             status_code = int(parts[1])
             status_text = parts[2] if len(parts) > 2 else ''
         else:
             return {'error': 'Línea de estado inválida', 'status_code': None}
-        
-        # Parsear headers
+
+        # Parsear headers recorriendo los bytes con find (implementado en C)
+        # en lugar de decodificar y trocear todo el bloque con split
         headers = {}
-        for line in lines[1:]:
-            if ':' in line:
-                key, value = line.split(':', 1)
-                headers[key.strip()] = value.strip()
-        
+        i = line_end + 2
+        while i < header_end:
+            line_end = response.find(b'\r\n', i)
+            if line_end < 0 or line_end > header_end:
+                line_end = header_end
+            line = response[i:line_end]
+            colon = line.find(b':')
+            if colon > 0:
+                key = line[:colon].strip().decode('latin-1')
+                value = line[colon + 1:].strip().decode('latin-1')
+                headers[key] = value
+            i = line_end + 2
+
         return {
             'status_code': status_code,
             'status_text': status_text,
@@ -148,7 +303,7 @@ def test_single_request(path, method='GET'):
 
 def test_concurrent_requests(num_requests=10):
     """
-    Prueba múltiples solicitudes concurrentes para verificar ThreadingMixIn.
+    Prueba múltiples solicitudes concurrentes para verificar la concurrencia.
     """
     print(f"\n{'='*60}")
     print(f"Probando {num_requests} solicitudes concurrentes")
@@ -226,7 +381,7 @@ def main():
     
     # Pruebas de concurrencia
     print("\n" + "=" * 60)
-    print("PRUEBAS DE CONCURRENCIA (ThreadingMixIn)")
+    print("PRUEBAS DE CONCURRENCIA")
     print("=" * 60)
     
     test_concurrent_requests(10)
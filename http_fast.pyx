@@ -0,0 +1,73 @@
+# cython: language_level=3
+"""
+Rutas calientes del servidor HTTP compiladas a C con Cython (opcional).
+
+Compilar con:
+    pip install cython
+    python setup_fast.py build_ext --inplace
+
+Si el módulo no está compilado, http_server_threading.py usa las
+versiones equivalentes en Python puro de estas funciones.
+"""
+
+from libc.stdio cimport snprintf
+from libc.string cimport memchr
+
+
+cpdef parse_request_line(bytes data):
+    """
+    Parsea la línea de solicitud HTTP con memchr, sin listas intermedias.
+    Formato: METHOD /path HTTP/1.x
+
+    Returns:
+        tuple: (method bytes, path bytes, version bytes) o None si hay error
+    """
+    cdef const unsigned char* buf = data
+    cdef Py_ssize_t n = len(data)
+    cdef const unsigned char* end
+    cdef const unsigned char* sp1
+    cdef const unsigned char* sp2
+
+    end = <const unsigned char*>memchr(buf, 0x0D, n)  # '\r'
+    if end == NULL:
+        end = buf + n
+
+    sp1 = <const unsigned char*>memchr(buf, 0x20, end - buf)  # ' '
+    if sp1 == NULL or sp1 == buf:
+        return None
+
+    sp2 = <const unsigned char*>memchr(sp1 + 1, 0x20, end - (sp1 + 1))
+    if sp2 == NULL:
+        return None
+
+    # La línea debe tener exactamente tres partes
+    if memchr(sp2 + 1, 0x20, end - (sp2 + 1)) != NULL:
+        return None
+
+    return (data[:sp1 - buf],
+            data[sp1 - buf + 1:sp2 - buf],
+            data[sp2 - buf + 1:end - buf])
+
+
+cpdef bytes build_header_prefix(int status_code, bytes status_text,
+                                bytes content_type, Py_ssize_t content_length):
+    """
+    Construye el bloque de headers de una respuesta (sin la línea Date)
+    con un solo snprintf en C, en lugar de f-strings + encode.
+    """
+    cdef char buf[512]
+    cdef int written
+
+    written = snprintf(buf, sizeof(buf),
+                       "HTTP/1.1 %d %s\r\n"
+                       "Server: PythonHTTP/1.0\r\n"
+                       "Content-Type: %s\r\n"
+                       "Content-Length: %zd\r\n"
+                       "Connection: keep-alive\r\n",
+                       status_code, <const char*>status_text,
+                       <const char*>content_type, content_length)
+
+    if written < 0 or written >= <int>sizeof(buf):
+        raise ValueError("cabecera demasiado larga")
+
+    return buf[:written]
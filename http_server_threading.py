@@ -1,23 +1,92 @@
 """
-Servidor HTTP con ThreadingMixIn
+Servidor HTTP con asyncio y pool de hilos
 Implementación del método GET siguiendo RFC 9110
-Para Windows - usando hilos para concurrencia
+Modo por defecto: asyncio (un solo hilo, E/S asíncrona)
+Modo alternativo: pool de hilos (--threads), para comparación
 
 Autor: Ejemplo para Maestría en Tecnologías de Internet
 Universidad de Colima
 """
 
+import asyncio
+import logging
+import logging.handlers
+import mmap
+import socket
 import socketserver
 import os
-import mimetypes
-from datetime import datetime, timezone
-from urllib.parse import unquote, urlparse
+import stat
+import sys
+import time
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
+from urllib.parse import unquote
+
+# uvloop acelera el event loop de asyncio (opcional, solo Linux/macOS)
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# httptools (binding de llhttp, el parser C de Node.js) parsea la solicitud
+# 10-50x más rápido que el parser en Python puro (opcional)
+try:
+    import httptools
+except ImportError:
+    httptools = None
+
+# http_fast es nuestro módulo Cython con las rutas calientes compiladas a C
+# (opcional; ver setup_fast.py)
+try:
+    import http_fast
+except ImportError:
+    http_fast = None
 
 # Configuración del servidor
 HOST = 'localhost'
 PORT = 8080
 DOCUMENT_ROOT = './www'  # Carpeta raíz para servir archivos
 
+# Tamaño máximo aceptado para la cabecera de una solicitud
+MAX_REQUEST_SIZE = 8192
+
+# Segundos que una conexión persistente puede quedar ociosa antes de cerrarse
+KEEPALIVE_TIMEOUT = 5
+
+# sendmsg permite enviar cabecera y cuerpo en un solo syscall sin
+# concatenarlos antes (no disponible en Windows)
+_HAS_SENDMSG = hasattr(socket.socket, 'sendmsg')
+
+# Ruta absoluta real de la raíz de documentos (symlinks resueltos),
+# calculada una sola vez al importar el módulo
+ABS_DOCUMENT_ROOT = os.path.realpath(DOCUMENT_ROOT)
+
+# Tipos MIME precalculados para los archivos que sirve este servidor.
+# Evita consultar la base de datos de mimetypes en cada solicitud.
+MIME_TYPES = {
+    '.html': 'text/html; charset=utf-8',
+    '.htm': 'text/html; charset=utf-8',
+    '.css': 'text/css',
+    '.js': 'application/javascript',
+    '.json': 'application/json',
+    '.txt': 'text/plain; charset=utf-8',
+    '.png': 'image/png',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.gif': 'image/gif',
+    '.ico': 'image/x-icon',
+    '.svg': 'image/svg+xml',
+}
+
+# Métodos soportados -> si la respuesta incluye cuerpo.
+# Un lookup en dict reemplaza la escalera if/elif del despacho.
+METHOD_DISPATCH = {
+    b'GET': True,
+    b'HEAD': False,
+}
+
 # Códigos de estado HTTP
 HTTP_STATUS = {
     200: 'OK',
@@ -28,185 +97,380 @@ HTTP_STATUS = {
     500: 'Internal Server Error',
 }
 
+# Los archivos mayores a este umbral no se copian a memoria: se mapean con
+# mmap (vista sin copia; el kernel sirve las páginas desde la page cache)
+LARGE_FILE_THRESHOLD = 256 * 1024
+
+# Máximo de entradas en la caché de archivos; al superarlo se desaloja
+# la entrada más antigua (y se libera su mmap si lo tenía)
+MAX_CACHE_ENTRIES = 128
+
+# Caché de archivos estáticos: ruta -> (headers pregenerados, contenido, mtime).
+# Los headers se generan una sola vez al llenar la entrada (solo falta
+# agregar la línea Date por solicitud). El contenido es bytes para archivos
+# chicos y un mmap para los grandes.
+# Un os.stat valida la frescura de cada entrada; solo se relee el archivo
+# del disco cuando cambió su fecha de modificación.
+_FILE_CACHE = {}
+_CACHE_LOCK = threading.RLock()
 
-class HTTPRequestHandler(socketserver.BaseRequestHandler):
+# Fecha HTTP cacheada con granularidad de 1 segundo: [valor, timestamp].
+# Evita un strftime por respuesta; el header Date no necesita más resolución.
+_DATE_CACHE = ['', 0]
+
+
+def get_content_type(file_path):
     """
-    Manejador de solicitudes HTTP.
-    Procesa solicitudes GET y devuelve recursos estáticos.
+    Determina el tipo MIME de un archivo por su extensión.
+
+    Solo usa el diccionario precalculado MIME_TYPES: cubre todo lo que
+    sirve este servidor y evita cargar la base de datos de mimetypes.
+    Extensiones desconocidas se sirven como application/octet-stream.
     """
-    
-    def handle(self):
-        """
-        Método principal que se llama cuando llega una solicitud.
-        """
+    ext = os.path.splitext(file_path)[1].lower()
+    return MIME_TYPES.get(ext, 'application/octet-stream')
+
+
+def build_header_prefix(status_code, content_length, content_type):
+    """
+    Construye el bloque de headers de una respuesta, sin la línea Date.
+
+    Para archivos cacheados este bloque se genera una sola vez (al llenar
+    la entrada de caché) en lugar de en cada solicitud.
+
+    Returns:
+        bytes: headers terminados en CRLF, sin Date ni línea en blanco final
+    """
+    status_text = HTTP_STATUS.get(status_code, 'Unknown')
+
+    if http_fast is not None:
+        return http_fast.build_header_prefix(
+            status_code, status_text.encode('ascii'),
+            content_type.encode('ascii'), content_length)
+
+    return (f"HTTP/1.1 {status_code} {status_text}\r\n"
+            f"Server: PythonHTTP/1.0\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {content_length}\r\n"
+            f"Connection: keep-alive\r\n").encode('utf-8')
+
+
+def load_entry(file_path, st):
+    """
+    Obtiene la entrada de caché de un archivo, rellenándola si hace falta.
+
+    Args:
+        file_path: Ruta absoluta del archivo
+        st: Resultado de os.stat ya obtenido para ese archivo
+
+    Returns:
+        tuple: (headers pregenerados sin Date, contenido (bytes o mmap
+        para archivos grandes), mtime)
+    """
+    entry = _FILE_CACHE.get(file_path)
+    if entry is not None and entry[2] == st.st_mtime:
+        return entry
+
+    # Cache miss: leer del disco y guardar bajo el lock
+    with _CACHE_LOCK:
+        # Otro hilo pudo haber llenado la entrada mientras esperábamos
+        entry = _FILE_CACHE.get(file_path)
+        if entry is not None and entry[2] == st.st_mtime:
+            return entry
+
+        if st.st_size > LARGE_FILE_THRESHOLD:
+            # Archivo grande: mapearlo en vez de copiarlo a memoria
+            fd = os.open(file_path, os.O_RDONLY)
+            try:
+                content = mmap.mmap(fd, st.st_size, access=mmap.ACCESS_READ)
+            finally:
+                # El mmap mantiene su propia referencia al archivo
+                os.close(fd)
+        else:
+            with open(file_path, 'rb') as f:
+                content = f.read()
+
+        # Desalojar la entrada reemplazada y, si la caché está llena,
+        # también la más antigua (los dict conservan orden de inserción)
+        _evict(file_path)
+        if len(_FILE_CACHE) >= MAX_CACHE_ENTRIES:
+            _evict(next(iter(_FILE_CACHE)))
+
+        content_type = get_content_type(file_path)
+        header_prefix = build_header_prefix(200, st.st_size, content_type)
+        entry = (header_prefix, content, st.st_mtime)
+        _FILE_CACHE[file_path] = entry
+
+    return entry
+
+
+def _evict(file_path):
+    """
+    Saca una entrada de la caché y libera su mmap si lo tenía.
+    Se llama con _CACHE_LOCK tomado.
+    """
+    entry = _FILE_CACHE.pop(file_path, None)
+    if entry is not None and isinstance(entry[1], mmap.mmap):
         try:
-            # Recibir datos del cliente (máximo 4KB para la solicitud)
-            data = self.request.recv(4096).decode('utf-8', errors='ignore')
-            
-            if not data:
-                return
-            
-            # Parsear la solicitud HTTP
-            request_info = self.parse_request(data)
-            
-            if request_info is None:
-                self.send_error(400, "Solicitud mal formada")
-                return
-            
-            method, path, version = request_info
-            
-            print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] "
-                  f"{self.client_address[0]}:{self.client_address[1]} - "
-                  f"{method} {path}")
-            
-            # Solo aceptamos GET (y HEAD como bonus)
-            if method == 'GET':
-                self.handle_get(path)
-            elif method == 'HEAD':
-                self.handle_get(path, include_body=False)
-            else:
-                self.send_error(405, f"Método {method} no permitido")
-                
-        except Exception as e:
-            print(f"Error procesando solicitud: {e}")
-            self.send_error(500, "Error interno del servidor")
-    
-    def parse_request(self, data):
+            entry[1].close()
+        except BufferError:
+            # Todavía hay una respuesta en vuelo usando la vista;
+            # el recolector cerrará el mmap cuando se libere
+            pass
+
+
+class BatchedFileCache:
+    """
+    Fachada de la caché de archivos que agrupa búsquedas por lotes.
+
+    Bajo el modo con hilos cada hilo competiría por _CACHE_LOCK en cada
+    solicitud. En su lugar, los hilos encolan su pedido y un hilo dedicado
+    drena lotes de hasta BATCH_SIZE pedidos, los resuelve bajo UNA sola
+    adquisición del lock y despierta a los hilos en espera. Con N hilos
+    concurrentes, el lock se toma O(lotes) veces en vez de O(solicitudes).
+
+    Solo se usa en el modo con hilos; el modo asyncio corre en un único
+    hilo y consulta la caché directamente.
+    """
+
+    BATCH_SIZE = 64
+
+    def __init__(self):
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def get(self, file_path, st):
         """
-        Parsea la línea de solicitud HTTP.
-        Formato: METHOD /path HTTP/1.x
-        
+        Encola el pedido y espera el resultado del hilo resolutor.
+
         Returns:
-            tuple: (method, path, version) o None si hay error
+            tuple: la entrada de caché (igual que load_entry)
         """
-        lines = data.split('\r\n')
-        if not lines:
-            return None
-        
-        request_line = lines[0]
-        parts = request_line.split(' ')
-        
-        if len(parts) != 3:
-            return None
-        
-        method, path, version = parts
-        
-        # Decodificar caracteres URL-encoded
+        event = threading.Event()
+        slot = [None, None]  # [resultado, excepción]
+        self._queue.put((file_path, st, event, slot))
+        event.wait()
+        if slot[1] is not None:
+            raise slot[1]
+        return slot[0]
+
+    def _run(self):
+        while True:
+            # Esperar el primer pedido y drenar sin bloquear hasta
+            # completar el lote
+            batch = [self._queue.get()]
+            while len(batch) < self.BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            # Una sola adquisición del lock para todo el lote
+            # (load_entry re-entra sin costo porque es un RLock)
+            with _CACHE_LOCK:
+                for file_path, st, event, slot in batch:
+                    try:
+                        slot[0] = load_entry(file_path, st)
+                    except Exception as e:
+                        slot[1] = e
+                    event.set()
+
+
+# Instancia activa de la caché por lotes (solo en el modo con hilos)
+_BATCHED_CACHE = None
+
+
+def enable_batched_cache():
+    """
+    Activa la caché por lotes. Se llama al arrancar el modo con hilos.
+    """
+    global _BATCHED_CACHE
+    if _BATCHED_CACHE is None:
+        _BATCHED_CACHE = BatchedFileCache()
+        _BATCHED_CACHE.start()
+
+
+# Log asíncrono: imprimir con print bajo concurrencia serializa a todos los
+# hilos en el lock de stdout. Con QueueHandler cada hilo solo encola el
+# registro y un hilo dedicado (QueueListener) lo escribe a stdout
+_LOG_QUEUE = queue.SimpleQueue()
+
+logger = logging.getLogger('http')
+logger.setLevel(logging.INFO)
+logger.addHandler(logging.handlers.QueueHandler(_LOG_QUEUE))
+logger.propagate = False
+
+_log_output = logging.StreamHandler(sys.stdout)
+_log_output.setFormatter(
+    logging.Formatter('[%(asctime)s] %(message)s', '%Y-%m-%d %H:%M:%S'))
+_LOG_LISTENER = logging.handlers.QueueListener(_LOG_QUEUE, _log_output)
+_LOG_LISTENER.start()
+
+
+def get_http_date():
+    """
+    Retorna la fecha actual en formato HTTP (RFC 7231), cacheada con
+    granularidad de 1 segundo para no formatear una fecha por respuesta.
+    Ejemplo: Sun, 06 Nov 1994 08:49:37 GMT
+    """
+    now = int(time.time())
+    if now != _DATE_CACHE[1]:
+        # formatdate evita el costo de datetime.now + strftime
+        _DATE_CACHE[0] = formatdate(now, usegmt=True)
+        _DATE_CACHE[1] = now
+    return _DATE_CACHE[0]
+
+
+def clean_path(raw_path):
+    """
+    Convierte el path crudo (bytes) de la solicitud en un path str limpio.
+
+    Ruta rápida: en el caso común no hay query string (?) ni caracteres
+    percent-encoded (%), así que basta decodificar los bytes; unquote
+    solo se paga cuando de verdad aparece un %.
+    """
+    q = raw_path.find(b'?')
+    if q >= 0:
+        raw_path = raw_path[:q]
+
+    path = raw_path.decode('utf-8', errors='ignore')
+
+    if b'%' in raw_path:
         path = unquote(path)
-        
-        # Extraer solo el path (sin query string)
-        parsed = urlparse(path)
-        path = parsed.path
-        
-        return method, path, version
-    
-    def handle_get(self, path, include_body=True):
-        """
-        Maneja solicitudes GET.
-        
-        Args:
-            path: Ruta del recurso solicitado
-            include_body: Si es False, solo envía headers (para HEAD)
-        """
-        # Prevenir directory traversal attacks
-        if '..' in path:
-            self.send_error(403, "Acceso prohibido")
-            return
-        
-        # Si es la raíz, buscar index.html
-        if path == '/':
-            path = '/index.html'
-        
-        # Construir la ruta completa del archivo
-        file_path = os.path.join(DOCUMENT_ROOT, path.lstrip('/'))
-        file_path = os.path.normpath(file_path)
-        
-        # Verificar que el archivo esté dentro de DOCUMENT_ROOT
-        if not file_path.startswith(os.path.normpath(DOCUMENT_ROOT)):
-            self.send_error(403, "Acceso prohibido")
-            return
-        
-        # Verificar si el archivo existe
-        if not os.path.exists(file_path):
-            self.send_error(404, f"Recurso no encontrado: {path}")
-            return
-        
-        # Si es un directorio, buscar index.html
-        if os.path.isdir(file_path):
-            file_path = os.path.join(file_path, 'index.html')
-            if not os.path.exists(file_path):
-                self.send_error(404, "index.html no encontrado en el directorio")
-                return
-        
-        # Leer y enviar el archivo
-        try:
-            with open(file_path, 'rb') as f:
-                content = f.read()
-            
-            # Determinar el tipo MIME
-            content_type, _ = mimetypes.guess_type(file_path)
-            if content_type is None:
-                content_type = 'application/octet-stream'
-            
-            # Enviar respuesta exitosa
-            self.send_response(200, content, content_type, include_body)
-            
-        except PermissionError:
-            self.send_error(403, "Permiso denegado")
-        except Exception as e:
-            self.send_error(500, f"Error leyendo archivo: {e}")
-    
-    def send_response(self, status_code, body, content_type, include_body=True):
-        """
-        Envía una respuesta HTTP completa.
-        
-        Args:
-            status_code: Código de estado HTTP
-            body: Contenido del cuerpo (bytes)
-            content_type: Tipo MIME del contenido
-            include_body: Si incluir el cuerpo en la respuesta
-        """
-        status_text = HTTP_STATUS.get(status_code, 'Unknown')
-        
-        # Construir headers
-        headers = [
-            f"HTTP/1.1 {status_code} {status_text}",
-            f"Date: {self.get_http_date()}",
-            f"Server: PythonHTTP/1.0 (ThreadingMixIn)",
-            f"Content-Type: {content_type}",
-            f"Content-Length: {len(body)}",
-            "Connection: close",
-            "",
-            ""
-        ]
-        
-        response = '\r\n'.join(headers).encode('utf-8')
-        
-        if include_body:
-            response += body
-        
-        self.request.sendall(response)
-    
-    def send_error(self, status_code, message):
-        """
-        Envía una respuesta de error HTTP.
-        
-        Args:
-            status_code: Código de estado HTTP
-            message: Mensaje de error
-        """
-        status_text = HTTP_STATUS.get(status_code, 'Unknown')
-        
-        # Crear página HTML de error
-        body = f"""<!DOCTYPE html>
+
+    return path
+
+
+def parse_request(data):
+    """
+    Parsea la línea de solicitud HTTP a nivel de bytes.
+    Formato: METHOD /path HTTP/1.x
+
+    Solo se decodifica el path: bytes.find (implementado en C) localiza el
+    CRLF sin decodificar ni trocear toda la cabecera, y método y versión
+    se devuelven como bytes para compararlos sin conversión.
+
+    Args:
+        data: Cabecera de la solicitud en bytes
+
+    Returns:
+        tuple: (method bytes, path str, version bytes) o None si hay error
+    """
+    if http_fast is not None:
+        parts = http_fast.parse_request_line(data)
+    else:
+        end = data.find(b'\r\n')
+        if end < 0:
+            end = len(data)
+
+        line_parts = data[:end].split(b' ')
+        parts = tuple(line_parts) if len(line_parts) == 3 else None
+
+    if parts is None:
+        return None
+
+    method, path, version = parts
+
+    return method, clean_path(path), version
+
+
+class _RequestParserCallbacks:
+    """
+    Callbacks para httptools.HttpRequestParser.
+    Solo nos interesa la URL; el método y la versión los da el parser.
+    """
+    __slots__ = ('url',)
+
+    def __init__(self):
+        self.url = None
+
+    def on_url(self, url):
+        self.url = url
+
+
+def parse_head(data):
+    """
+    Parsea la cabecera de una solicitud HTTP recibida en bytes.
+
+    Usa httptools (parser en C) si está instalado; si no, el parser
+    en Python puro de parse_request.
+
+    Returns:
+        tuple: (method bytes, path str, version bytes) o None si hay error
+    """
+    if httptools is None:
+        return parse_request(data)
+
+    callbacks = _RequestParserCallbacks()
+    parser = httptools.HttpRequestParser(callbacks)
+    try:
+        parser.feed_data(data)
+    except httptools.HttpParserError:
+        return None
+
+    if callbacks.url is None:
+        return None
+
+    method = parser.get_method()
+    version = b'HTTP/' + parser.get_http_version().encode('ascii')
+
+    return method, clean_path(callbacks.url), version
+
+
+def build_response(status_code, body, content_type, include_body=True):
+    """
+    Construye una respuesta HTTP completa.
+
+    Args:
+        status_code: Código de estado HTTP
+        body: Contenido del cuerpo (bytes)
+        content_type: Tipo MIME del contenido
+        include_body: Si incluir el cuerpo en la respuesta
+
+    Returns:
+        bytes: Respuesta HTTP lista para enviar
+    """
+    status_text = HTTP_STATUS.get(status_code, 'Unknown')
+
+    # Construir headers
+    headers = [
+        f"HTTP/1.1 {status_code} {status_text}",
+        f"Date: {get_http_date()}",
+        f"Server: PythonHTTP/1.0",
+        f"Content-Type: {content_type}",
+        f"Content-Length: {len(body)}",
+        "Connection: close",
+        "",
+        ""
+    ]
+
+    response = '\r\n'.join(headers).encode('utf-8')
+
+    if include_body:
+        response += body
+
+    return response
+
+
+def _render_error_page(status_code):
+    """
+    Genera la página HTML estática para un código de error.
+    Se llama una sola vez por código, al importar el módulo.
+    """
+    status_text = HTTP_STATUS.get(status_code, 'Unknown')
+
+    body = f"""<!DOCTYPE html>
 <html lang="es">
 <head>
     <meta charset="UTF-8">
     <title>Error {status_code}</title>
     <style>
-        body {{ 
-            font-family: Arial, sans-serif; 
-            text-align: center; 
+        body {{
+            font-family: Arial, sans-serif;
+            text-align: center;
             padding: 50px;
             background-color: #f5f5f5;
         }}
@@ -218,33 +482,352 @@ class HTTPRequestHandler(socketserver.BaseRequestHandler):
 <body>
     <div class="error-code">{status_code}</div>
     <h1>{status_text}</h1>
-    <p class="message">{message}</p>
     <hr>
-    <small>PythonHTTP/1.0 (ThreadingMixIn)</small>
+    <small>PythonHTTP/1.0</small>
 </body>
 </html>"""
-        
-        self.send_response(status_code, body.encode('utf-8'), 'text/html; charset=utf-8')
-    
-    def get_http_date(self):
-        """
-        Retorna la fecha actual en formato HTTP (RFC 7231).
-        Ejemplo: Sun, 06 Nov 1994 08:49:37 GMT
-        """
-        now = datetime.now(timezone.utc)
-        return now.strftime('%a, %d %b %Y %H:%M:%S GMT')
 
+    return body.encode('utf-8')
+
+
+# Páginas de error pre-renderizadas por código de estado: el bloque
+# HTML/CSS no se vuelve a interpolar ni codificar en cada error
+_ERROR_BODIES = {code: _render_error_page(code)
+                 for code in HTTP_STATUS if code >= 400}
+
+
+def build_error(status_code, message=''):
+    """
+    Construye una respuesta de error HTTP con página HTML.
+
+    La página se toma pre-renderizada de _ERROR_BODIES; el mensaje
+    específico, si lo hay, se agrega como fragmento al final en lugar
+    de re-renderizar toda la página.
+
+    Args:
+        status_code: Código de estado HTTP
+        message: Mensaje de error específico (opcional)
+
+    Returns:
+        bytes: Respuesta HTTP lista para enviar
+    """
+    body = _ERROR_BODIES.get(status_code)
+    if body is None:
+        body = _render_error_page(status_code)
+
+    if message:
+        body += f'\n<p class="message">{message}</p>'.encode('utf-8')
+
+    return build_response(status_code, body, 'text/html; charset=utf-8')
+
+
+def resolve_get(path, include_body=True):
+    """
+    Resuelve una solicitud GET/HEAD y construye la respuesta completa.
+
+    Args:
+        path: Ruta del recurso solicitado
+        include_body: Si es False, solo se incluyen headers (para HEAD)
+
+    Returns:
+        tuple: (headers en bytes, cuerpo o None). El cuerpo es bytes para
+        archivos chicos y un memoryview del mmap para los grandes; se
+        devuelve separado de la cabecera para enviarlos con E/S
+        vectorizada sin concatenarlos antes.
+    """
+    # Si es la raíz, buscar index.html
+    if path == '/':
+        path = '/index.html'
+
+    # Construir la ruta real del archivo (resuelve ".." y symlinks)
+    try:
+        file_path = os.path.realpath(os.path.join(ABS_DOCUMENT_ROOT, path.lstrip('/')))
+    except ValueError:
+        # Bytes que no forman una ruta válida (p.ej. %00, nulo embebido)
+        return build_error(404, f"Recurso no encontrado: {path}"), None
+
+    # Prevenir directory traversal: la ruta resuelta debe quedar dentro
+    # de DOCUMENT_ROOT. A diferencia del viejo chequeo "'..' in path",
+    # esto no rechaza nombres legítimos como "mi..archivo.txt" y también
+    # cubre escapes vía symlinks
+    if file_path != ABS_DOCUMENT_ROOT and not file_path.startswith(ABS_DOCUMENT_ROOT + os.sep):
+        return build_error(403, "Acceso prohibido"), None
+
+    # Un solo os.stat resuelve existencia, tipo y frescura de caché.
+    # OSError cubre también NotADirectoryError (GET /index.html/foo),
+    # PermissionError, nombres demasiado largos, etc.
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return build_error(404, f"Recurso no encontrado: {path}"), None
+
+    # Si es un directorio, buscar index.html (el stat ya nos dice el tipo)
+    if stat.S_ISDIR(st.st_mode):
+        file_path = os.path.join(file_path, 'index.html')
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return build_error(404, "index.html no encontrado en el directorio"), None
+
+    # HEAD: el cuerpo no se envía, así que no hay que leerlo (ni del disco
+    # ni de la caché); Content-Length sale directo del stat
+    if not include_body:
+        head = build_header_prefix(200, st.st_size, get_content_type(file_path))
+        return head + b'Date: ' + get_http_date().encode('ascii') + b'\r\n\r\n', None
+
+    # Obtener la entrada de caché (por lotes en el modo con hilos)
+    # y completar los headers con Date
+    try:
+        if _BATCHED_CACHE is not None:
+            header_prefix, content, _ = _BATCHED_CACHE.get(file_path, st)
+        else:
+            header_prefix, content, _ = load_entry(file_path, st)
+    except PermissionError:
+        return build_error(403, "Permiso denegado"), None
+    except Exception as e:
+        return build_error(500, f"Error leyendo archivo: {e}"), None
+
+    head = header_prefix + b'Date: ' + get_http_date().encode('ascii') + b'\r\n\r\n'
+
+    if isinstance(content, mmap.mmap):
+        # Archivo grande: enviar la vista mapeada sin copiarla
+        return head, memoryview(content)
+
+    return head, content
 
-class ThreadedHTTPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+
+def send_vectored(sock, head, body):
     """
-    Servidor HTTP con soporte para múltiples hilos.
-    Cada conexión se maneja en un hilo separado.
+    Envía cabecera y cuerpo por un socket en un solo syscall (sendmsg),
+    sin construir antes el bytes concatenado cabecera+cuerpo.
+
+    Si sendmsg no existe (Windows) o envió parcialmente, se completa
+    con sendall sobre memoryviews (sin copiar los bytes restantes).
+    """
+    if body is None:
+        sock.sendall(head)
+        return
+
+    if not _HAS_SENDMSG:
+        sock.sendall(head)
+        sock.sendall(body)
+        return
+
+    sent = sock.sendmsg([head, body])
+    if sent < len(head):
+        sock.sendall(memoryview(head)[sent:])
+        sock.sendall(body)
+    elif sent < len(head) + len(body):
+        sock.sendall(memoryview(body)[sent - len(head):])
+
+
+def dispatch_request(data, client_address):
+    """
+    Parsea una solicitud cruda y la despacha al método correspondiente.
+
+    Args:
+        data: Bytes recibidos del cliente (cabecera de la solicitud)
+        client_address: Tupla (ip, puerto) del cliente, para el log
+
+    Returns:
+        tuple: (headers en bytes, cuerpo (bytes/memoryview) o None,
+        True si la conexión debe mantenerse abierta)
+    """
+    request_info = parse_head(data)
+
+    if request_info is None:
+        return build_error(400, "Solicitud mal formada"), None, False
+
+    method, path, version = request_info
+
+    # El timestamp lo pone el Formatter en el hilo del listener, no aquí
+    logger.info('%s:%s - %s %s',
+                client_address[0], client_address[1],
+                method.decode('ascii', errors='ignore'), path)
+
+    # HTTP/1.1 mantiene la conexión abierta salvo pedido explícito
+    keep_alive = (version == b'HTTP/1.1'
+                  and b'connection: close' not in data.lower())
+
+    # Solo aceptamos GET (y HEAD como bonus)
+    include_body = METHOD_DISPATCH.get(method)
+    if include_body is None:
+        method_text = method.decode('ascii', errors='ignore')
+        return build_error(405, f"Método {method_text} no permitido"), None, False
+
+    head, body = resolve_get(path, include_body=include_body)
+
+    # Las respuestas de error llevan "Connection: close": cerrar también aquí
+    if not head.startswith(b'HTTP/1.1 200'):
+        keep_alive = False
+
+    return head, body, keep_alive
+
+
+# ---------------------------------------------------------------------------
+# Modo asyncio (por defecto): E/S asíncrona en un solo hilo
+# ---------------------------------------------------------------------------
+
+async def handle_client(reader, writer):
+    """
+    Corrutina que atiende una conexión en el servidor asyncio.
+    Equivale a HTTPRequestHandler.handle pero sin hilos.
+    """
+    client_address = writer.get_extra_info('peername') or ('?', 0)
+
+    try:
+        # Conexión persistente: atender solicitudes hasta que el cliente
+        # cierre, pida "Connection: close" o se agote el timeout de ocio
+        while True:
+            try:
+                # Leer hasta el fin de la cabecera (limitado por MAX_REQUEST_SIZE)
+                data = await asyncio.wait_for(
+                    reader.readuntil(b'\r\n\r\n'), KEEPALIVE_TIMEOUT)
+            except asyncio.IncompleteReadError as e:
+                data = e.partial
+            except (asyncio.TimeoutError, ConnectionResetError):
+                return
+            except asyncio.LimitOverrunError:
+                writer.write(build_error(400, "Solicitud demasiado grande"))
+                await writer.drain()
+                return
+
+            if not data:
+                return
+
+            head, body, keep_alive = dispatch_request(data, client_address)
+
+            # El transporte encadena los buffers sin concatenarlos
+            if body is not None:
+                writer.writelines([head, body])
+            else:
+                writer.write(head)
+            await writer.drain()
+
+            if not keep_alive:
+                return
+
+    except Exception as e:
+        logger.error('Error procesando solicitud: %s', e)
+    finally:
+        writer.close()
+
+
+async def serve_asyncio():
+    """
+    Crea y ejecuta el servidor asyncio.
+    """
+    # SO_REUSEPORT (si existe) permite levantar varios procesos servidores
+    # en el mismo puerto para escalar entre núcleos
+    server = await asyncio.start_server(
+        handle_client, HOST, PORT,
+        limit=MAX_REQUEST_SIZE, backlog=4096,
+        reuse_port=hasattr(socket, 'SO_REUSEPORT'))
+
+    async with server:
+        await server.serve_forever()
+
+
+# ---------------------------------------------------------------------------
+# Modo con hilos (--threads): pool acotado de hilos trabajadores
+# ---------------------------------------------------------------------------
+
+def handle_connection(sock, client_address):
+    """
+    Atiende una conexión completa en el modo con hilos.
+
+    Es una función libre en lugar de un BaseRequestHandler: así no se
+    instancia un objeto manejador (con sus hooks setup/finish y varias
+    indirecciones de métodos) por cada conexión.
+    """
+    # TCP_NODELAY: enviar las respuestas de inmediato, sin esperar
+    # a acumular más datos (algoritmo de Nagle)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.settimeout(KEEPALIVE_TIMEOUT)
+
+    buffer = b''
+    try:
+        # Conexión persistente: atender solicitudes hasta que el cliente
+        # cierre, pida "Connection: close" o se agote el timeout de ocio
+        while True:
+            # Acumular hasta el fin de la cabecera (\r\n\r\n), igual que
+            # readuntil en el modo asyncio: la cabecera puede llegar
+            # partida en varios segmentos TCP, y con pipelining pueden
+            # llegar varias solicitudes juntas en uno solo
+            end = buffer.find(b'\r\n\r\n')
+            while end == -1:
+                if len(buffer) >= MAX_REQUEST_SIZE:
+                    sock.sendall(build_error(400, "Solicitud demasiado grande"))
+                    return
+                chunk = sock.recv(4096)
+                if not chunk:
+                    if not buffer:
+                        return
+                    break  # Cabecera truncada: despacharla tal cual
+                buffer += chunk
+                end = buffer.find(b'\r\n\r\n')
+
+            # Despachar solo la cabecera actual (así el sniff de
+            # "Connection: close" no lee solicitudes pipelineadas) y
+            # guardar el resto para la siguiente iteración
+            if end == -1:
+                data, buffer = buffer, b''
+            else:
+                data, buffer = buffer[:end + 4], buffer[end + 4:]
+
+            head, body, keep_alive = dispatch_request(data, client_address)
+            send_vectored(sock, head, body)
+
+            if not keep_alive:
+                return
+
+    except (socket.timeout, ConnectionResetError):
+        return
+    except Exception as e:
+        logger.error('Error procesando solicitud: %s', e)
+        sock.sendall(build_error(500, "Error interno del servidor"))
+
+
+class PooledHTTPServer(socketserver.TCPServer):
+    """
+    Servidor HTTP con un pool acotado de hilos trabajadores.
+
+    A diferencia de ThreadingMixIn (un hilo nuevo por conexión, sin
+    límite), un pool fijo de 32 hilos pone techo al consumo de memoria
+    (~MB de stack por hilo) y a los cambios de contexto bajo estrés.
     """
     # Permitir reutilizar la dirección inmediatamente
     allow_reuse_address = True
-    
-    # Los hilos se cerrarán cuando el servidor principal termine
-    daemon_threads = True
+
+    # Backlog del listen: con el valor por defecto (5) el kernel descarta
+    # SYNs bajo ráfagas de conexiones concurrentes
+    request_queue_size = 4096
+
+    # Pool de trabajadores compartido por todas las conexiones
+    _pool = ThreadPoolExecutor(max_workers=32)
+
+    def server_bind(self):
+        # SO_REUSEPORT (si existe) permite levantar varios procesos
+        # servidores en el mismo puerto para escalar entre núcleos
+        if hasattr(socket, 'SO_REUSEPORT'):
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+
+    def process_request(self, request, client_address):
+        # En lugar de crear un hilo por conexión, encolar al pool
+        self._pool.submit(self.process_request_thread, request, client_address)
+
+    def process_request_thread(self, request, client_address):
+        """
+        Atiende una conexión dentro de un hilo del pool, llamando a
+        handle_connection directamente (sin instanciar un manejador).
+        """
+        try:
+            handle_connection(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
 
 
 def create_sample_files():
@@ -254,7 +837,7 @@ def create_sample_files():
     # Crear directorio www si no existe
     if not os.path.exists(DOCUMENT_ROOT):
         os.makedirs(DOCUMENT_ROOT)
-    
+
     # Crear index.html
     index_html = """<!DOCTYPE html>
 <html lang="es">
@@ -270,18 +853,18 @@ def create_sample_files():
             <h1>🌐 Servidor HTTP con Sockets</h1>
             <p>Maestría en Tecnologías de Internet - Programación Avanzada</p>
         </header>
-        
+
         <main>
             <section class="info">
                 <h2>Información del Servidor</h2>
                 <ul>
                     <li><strong>Protocolo:</strong> HTTP/1.1</li>
                     <li><strong>Método implementado:</strong> GET</li>
-                    <li><strong>Concurrencia:</strong> ThreadingMixIn (hilos)</li>
+                    <li><strong>Concurrencia:</strong> asyncio (o hilos con --threads)</li>
                     <li><strong>Plataforma:</strong> Windows</li>
                 </ul>
             </section>
-            
+
             <section class="links">
                 <h2>Recursos de Prueba</h2>
                 <ul>
@@ -292,17 +875,17 @@ def create_sample_files():
                 </ul>
             </section>
         </main>
-        
+
         <footer>
             <p>Universidad de Colima - 2024</p>
         </footer>
     </div>
 </body>
 </html>"""
-    
+
     with open(os.path.join(DOCUMENT_ROOT, 'index.html'), 'w', encoding='utf-8') as f:
         f.write(index_html)
-    
+
     # Crear styles.css
     styles_css = """* {
     margin: 0;
@@ -382,10 +965,10 @@ footer {
     text-align: center;
     color: #666;
 }"""
-    
+
     with open(os.path.join(DOCUMENT_ROOT, 'styles.css'), 'w', encoding='utf-8') as f:
         f.write(styles_css)
-    
+
     # Crear about.html
     about_html = """<!DOCTYPE html>
 <html lang="es">
@@ -402,10 +985,11 @@ footer {
         <main>
             <section>
                 <h2>Implementación</h2>
-                <p>Este servidor HTTP está implementado usando el módulo <code>socketserver</code> 
-                de Python con <code>ThreadingMixIn</code> para manejar múltiples conexiones 
-                concurrentes usando hilos.</p>
-                
+                <p>Este servidor HTTP está implementado usando sockets de Python.
+                Por defecto usa <code>asyncio</code> (E/S asíncrona en un solo hilo);
+                con la opción <code>--threads</code> usa un pool acotado de hilos
+                para manejar múltiples conexiones concurrentes.</p>
+
                 <h2 style="margin-top: 20px;">Características</h2>
                 <ul>
                     <li>Soporte para método GET</li>
@@ -420,35 +1004,35 @@ footer {
     </div>
 </body>
 </html>"""
-    
+
     with open(os.path.join(DOCUMENT_ROOT, 'about.html'), 'w', encoding='utf-8') as f:
         f.write(about_html)
-    
+
     # Crear directorio api y archivo JSON
     api_dir = os.path.join(DOCUMENT_ROOT, 'api')
     if not os.path.exists(api_dir):
         os.makedirs(api_dir)
-    
+
     data_json = """{
     "servidor": "PythonHTTP",
     "version": "1.0",
     "metodos_soportados": ["GET", "HEAD"],
-    "concurrencia": "ThreadingMixIn",
+    "concurrencia": "asyncio",
     "universidad": "Universidad de Colima",
     "materia": "Programación Avanzada"
 }"""
-    
+
     with open(os.path.join(api_dir, 'data.json'), 'w', encoding='utf-8') as f:
         f.write(data_json)
-    
+
     # Crear directorio images y archivo de texto
     images_dir = os.path.join(DOCUMENT_ROOT, 'images')
     if not os.path.exists(images_dir):
         os.makedirs(images_dir)
-    
+
     with open(os.path.join(images_dir, 'logo.txt'), 'w', encoding='utf-8') as f:
         f.write("Este es un archivo de texto de ejemplo.\nServidor HTTP - Universidad de Colima")
-    
+
     print(f"✓ Archivos de ejemplo creados en '{DOCUMENT_ROOT}/'")
 
 
@@ -456,27 +1040,47 @@ def main():
     """
     Función principal que inicia el servidor.
     """
+    use_threads = '--threads' in sys.argv
+
     print("=" * 60)
-    print("  Servidor HTTP con ThreadingMixIn")
+    print("  Servidor HTTP con Sockets")
     print("  Maestría en Tecnologías de Internet")
     print("  Universidad de Colima")
     print("=" * 60)
-    
+
     # Crear archivos de ejemplo
     create_sample_files()
-    
+
     # Crear e iniciar el servidor
     try:
-        with ThreadedHTTPServer((HOST, PORT), HTTPRequestHandler) as server:
+        if use_threads:
+            enable_batched_cache()
+
+            # Sin RequestHandlerClass: las conexiones van directo a
+            # handle_connection
+            with PooledHTTPServer((HOST, PORT), None) as server:
+                print(f"\n✓ Servidor iniciado en http://{HOST}:{PORT}")
+                print(f"✓ Sirviendo archivos desde: {os.path.abspath(DOCUMENT_ROOT)}")
+                print(f"✓ Usando un pool de 32 hilos trabajadores")
+                print("\nPresiona Ctrl+C para detener el servidor...\n")
+                print("-" * 60)
+
+                # Mantener el servidor corriendo
+                server.serve_forever()
+        else:
+            # uvloop (si está instalado) reemplaza el event loop por uno más rápido
+            if uvloop is not None:
+                uvloop.install()
+
             print(f"\n✓ Servidor iniciado en http://{HOST}:{PORT}")
             print(f"✓ Sirviendo archivos desde: {os.path.abspath(DOCUMENT_ROOT)}")
-            print(f"✓ Usando ThreadingMixIn (un hilo por conexión)")
+            loop_name = 'uvloop' if uvloop is not None else 'asyncio'
+            print(f"✓ Usando {loop_name} (E/S asíncrona, un solo hilo)")
             print("\nPresiona Ctrl+C para detener el servidor...\n")
             print("-" * 60)
-            
-            # Mantener el servidor corriendo
-            server.serve_forever()
-            
+
+            asyncio.run(serve_asyncio())
+
     except KeyboardInterrupt:
         print("\n\n✓ Servidor detenido por el usuario.")
     except OSError as e:
@@ -0,0 +1,19 @@
+"""
+Script de compilación del módulo opcional http_fast (Cython).
+
+Uso:
+    pip install cython
+    python setup_fast.py build_ext --inplace
+
+El servidor funciona igual sin compilarlo; http_fast solo acelera
+las rutas calientes (parseo de la línea de solicitud y construcción
+de headers).
+"""
+
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name='http_fast',
+    ext_modules=cythonize('http_fast.pyx'),
+)